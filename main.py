@@ -2,9 +2,15 @@ import os
 import sys
 import requests
 import json
-from datetime import datetime
-from jira import JIRA
+import time
+import hashlib
+from datetime import datetime, date
+from concurrent.futures import ThreadPoolExecutor
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+from google.api_core import retry as google_retry
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # === 1. 환경 변수 로드 ===
 JIRA_SERVER = os.environ.get("JIRA_SERVER")
@@ -12,80 +18,331 @@ JIRA_EMAIL = os.environ.get("JIRA_EMAIL")
 JIRA_TOKEN = os.environ.get("JIRA_TOKEN")
 GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
 KAKAOWORK_WEBHOOK_URL = os.environ.get("KAKAOWORK_WEBHOOK_URL")
+REQUIRED_ENV_VARS = ("JIRA_SERVER", "JIRA_EMAIL", "JIRA_TOKEN", "GEMINI_API_KEY", "KAKAOWORK_WEBHOOK_URL")
 
 # === 2. 검색할 키워드 설정 ===
-TARGET_KEYWORDS = ["604", "624", "704"] 
+TARGET_KEYWORDS = ("604", "624", "704")  # 실행 중 바뀌지 않으므로 tuple
+TARGET_KEYWORDS_JOINED = ", ".join(TARGET_KEYWORDS)
+MAX_RESULTS_PER_KEYWORD = 10
+JIRA_FIELDS = "summary,status,assignee,updated"
+SUMMARY_MAX_LEN = 80  # 프롬프트에 넣는 이슈 제목 최대 길이
+DIRECT_SUMMARY_MAX_ISSUES = 1  # 이 건수 이하이면 AI 요약을 건너뜁니다.
 
-def get_jira_issues_by_keyword():
-    """Jira 이슈 수집 함수"""
-    combined_data = ""
-    found_any_issue = False
+# 검색 조건: 요약(summary) 또는 본문(text)에 키워드 포함 + 최근 30일 이내 업데이트
+# text 검색은 댓글 등 받아오지 않는 필드까지 대상으로 하므로, 결과를 한 번에 받아 로컬에서 키워드별로 나눌 수 없습니다.
+# 그래서 키워드마다 따로 검색해 키워드당 최대 MAX_RESULTS_PER_KEYWORD건을 보장하고, 요청은 동시에 보냅니다.
+# 키워드가 고정이므로 JQL과 요청 파라미터는 시작 시 한 번만 만듭니다.
+JQL_TEMPLATE = '(summary ~ "{k}" OR text ~ "{k}") AND updated >= "-30d" ORDER BY updated DESC'
+JIRA_SEARCH_PARAMS = {
+    keyword: {
+        "jql": JQL_TEMPLATE.format(k=keyword),
+        "maxResults": MAX_RESULTS_PER_KEYWORD,
+        "fields": JIRA_FIELDS,  # 실제로 사용하는 필드만 요청해 응답 크기를 줄입니다.
+    }
+    for keyword in TARGET_KEYWORDS
+}
+
+# === 3. HTTP 세션 (연결 재사용) ===
+# 호출마다 TCP+TLS 연결을 새로 맺지 않도록 모듈 전역 세션을 재사용합니다.
+# Jira 검색과 카카오워크 웹훅이 같은 세션을 쓰고, 웹훅 URL에는 재시도 정책이 다른 전용 어댑터를 장착합니다.
+HTTP_TIMEOUT = (3, 10)  # (연결, 응답) 타임아웃 초
+KAKAOWORK_TEXT_LIMIT = 500  # 카카오워크 본문에 싣는 최대 글자 수
+SESSION = requests.Session()
+SESSION.headers.update({"Content-Type": "application/json"})
+_adapter = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=10,
+    # 일시적 오류(429/5xx/연결 오류)만 지수 백오프(최대 30초)+지터로 재시도하고, 4xx는 재시도하지 않습니다.
+    max_retries=Retry(
+        total=5,
+        backoff_factor=1,
+        backoff_max=30,
+        backoff_jitter=1,
+        status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=True,
+    ),
+)
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
+# 웹훅 전송이 한 번 실패해 앞선 Jira 조회·Gemini 호출이 낭비되지 않도록 POST도 재시도합니다.
+# 단, 이미 접수됐을 수 있는 경우(응답 대기 중 끊김, 게이트웨이 500/502/504)는 재시도하지 않고,
+# 처리 전에 거절됐음이 분명한 429/503만 재시도합니다. (중복 전송 방지)
+_webhook_adapter = HTTPAdapter(
+    max_retries=_adapter.max_retries.new(read=0, status_forcelist=[429, 503], allowed_methods=["POST"])
+)
+if KAKAOWORK_WEBHOOK_URL:
+    SESSION.mount(KAKAOWORK_WEBHOOK_URL, _webhook_adapter)  # URL 접두사가 가장 긴 어댑터가 우선 적용됩니다.
+
+# === 4. Gemini 클라이언트 (프로세스당 한 번만 초기화) ===
+# ✅ 모델명 수정: 'gemini-2.5-flash-lite'가 현재 가장 안정적인 무료 티어 모델입니다.
+# (가장 작은 모델이 기본값이며, 필요하면 GEMINI_MODEL 환경 변수로 코드 수정 없이 바꿀 수 있습니다.)
+GEMINI_MODEL_NAME = os.environ.get("GEMINI_MODEL") or "gemini-2.5-flash-lite"
+genai.configure(api_key=GEMINI_API_KEY)
+# 카카오워크로는 앞부분만 전송되므로 출력 길이를 제한하고, 보고서 형식이 흔들리지 않도록 온도를 낮춥니다.
+GEMINI_GENERATION_CONFIG = {"max_output_tokens": 800, "temperature": 0.2}
+# 지시문은 실행마다 바이트 단위로 동일하게 유지되어야 제공자 측 프롬프트(prefix) 캐시가 적중합니다.
+REPORT_INSTRUCTION = f"""당신은 IT 프로젝트 매니저입니다. 사용자가 보내는 Jira 이슈 데이터를 분석하여 주간 보고서를 작성하세요.
+
+[요청사항]
+1. [{TARGET_KEYWORDS_JOINED}] 키워드별로 섹션을 나누어 정리하세요.
+2. 각 섹션마다 '현황 요약', '주요 이슈(ID포함)'를 포함하세요.
+3. 이슈가 없는 키워드는 "특이사항 없음"으로 명시하세요.
+4. 가독성 좋게 불렛포인트를 사용하여 작성하세요.
+"""
+GEMINI_MODEL = genai.GenerativeModel(
+    GEMINI_MODEL_NAME,
+    generation_config=GEMINI_GENERATION_CONFIG,
+    system_instruction=REPORT_INSTRUCTION,
+)
+# 일시적 오류(5xx/429/타임아웃)만 지수 백오프+지터로 재시도합니다. (인증 오류 등 4xx는 바로 실패)
+GEMINI_RETRY = google_retry.Retry(
+    predicate=google_retry.if_exception_type(
+        google_exceptions.ServiceUnavailable,
+        google_exceptions.InternalServerError,
+        google_exceptions.DeadlineExceeded,
+        google_exceptions.TooManyRequests,
+    ),
+    initial=1,
+    maximum=30,
+    timeout=120,
+)
+
+# === 5. 디스크 캐시 (LLM 응답 / Jira 검색 결과) ===
+# 같은 날 재실행 등으로 입력이 동일하면 Gemini·Jira를 다시 호출하지 않고 저장된 결과를 사용합니다.
+# 항목마다 파일 하나를 쓰고, 유효 기간은 파일 수정 시각으로 판단합니다.
+CACHE_DIR = ".cache"
+LLM_CACHE_DIR = os.path.join(CACHE_DIR, "llm")
+LLM_CACHE_TTL = 24 * 60 * 60  # 24시간
+JIRA_CACHE_DIR = os.path.join(CACHE_DIR, "jira")
+JIRA_CACHE_TTL = 60 * 60  # 1시간
+WEBHOOK_LOG_PATH = os.path.join(CACHE_DIR, "webhook_log.jsonl")
+WEBHOOK_LOG_MAX_ENTRIES = 50  # 웹훅 전송 기록 최대 보관 건수
+CACHE_MAX_ENTRIES = 100  # 캐시 폴더별 최대 항목 수 (초과 시 LRU 삭제)
+CACHE_TMP_MAX_AGE = 60 * 60  # 이보다 오래된 임시(.tmp) 파일은 중단된 저장으로 보고 삭제
 
+def make_cache_key(obj):
+    """정렬된 JSON의 SHA-256 해시 (논리적으로 같은 입력은 같은 키가 됨)"""
+    return hashlib.sha256(json.dumps(obj, sort_keys=True, ensure_ascii=False).encode()).hexdigest()
+
+def load_cache(directory, key, ttl):
+    """캐시 조회 (TTL 이내인 경우에만 반환)"""
+    path = os.path.join(directory, f"{key}.json")
     try:
-        # Jira 연결 인증
-        jira = JIRA(server=JIRA_SERVER, basic_auth=(JIRA_EMAIL, JIRA_TOKEN))
-        
-        for keyword in TARGET_KEYWORDS:
-            print(f"🔍 '{keyword}' 관련 이슈 검색 중...")
-            
-            # 검색 조건: 요약(summary) 또는 본문(text)에 키워드 포함 + 최근 30일 이내 업데이트
-            jql_query = f'(summary ~ "{keyword}" OR text ~ "{keyword}") AND updated >= "-30d" ORDER BY updated DESC'
-            issues = jira.search_issues(jql_query, maxResults=10)
-            
-            if not issues:
-                combined_data += f"\n### [{keyword}] 관련 최근 이슈 없음\n"
+        mtime = os.path.getmtime(path)
+        if time.time() - mtime >= ttl:
+            return None
+        with open(path, encoding="utf-8") as f:
+            value = json.load(f)
+        # 접근 시각(atime)만 갱신해 LRU 정리에 쓰고, TTL 기준인 수정 시각은 그대로 둡니다.
+        os.utime(path, (time.time(), mtime))
+        return value
+    except (OSError, ValueError):
+        return None
+
+def save_cache(directory, key, value):
+    """캐시 저장 (임시 파일에 쓴 뒤 os.replace로 교체해 쓰다 만 파일이 읽히지 않도록 함)"""
+    path = os.path.join(directory, f"{key}.json")
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(directory, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(value, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        # 캐시 저장 실패(권한, 디스크 부족 등)가 이미 받아온 결과를 버리게 해서는 안 됩니다.
+        print(f"⚠️ 캐시 저장 실패: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+def prune_cache(directory, ttl):
+    """만료된 항목을 지우고, CACHE_MAX_ENTRIES를 넘으면 가장 오래 쓰이지 않은 항목부터 삭제"""
+    now = time.time()
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return
+
+    # 다른 실행이나 캐시 복원이 먼저 지운 파일 등 항목별 오류는 건너뜁니다. (정리 실패가 본 작업을 망치면 안 됨)
+    alive = []
+    for entry in entries:
+        try:
+            if entry.name.endswith(".tmp"):
+                # 중단된 저장이 남긴 임시 파일 (다른 실행이 쓰는 중일 수 있는 최근 파일은 남겨 둠)
+                if now - entry.stat().st_mtime >= CACHE_TMP_MAX_AGE:
+                    os.remove(entry.path)
                 continue
-                
-            found_any_issue = True
-            combined_data += f"\n### [{keyword}] 관련 이슈 ({len(issues)}건)\n"
-            
-            for issue in issues:
-                summary = issue.fields.summary
-                status = issue.fields.status.name
-                assignee = issue.fields.assignee.displayName if issue.fields.assignee else "담당자 없음"
-                updated_date = issue.fields.updated[:10]
-                
-                combined_data += f"- **[{issue.key}]** {summary} (상태: {status} | 담당: {assignee} | 수정일: {updated_date})\n"
-        
-        return combined_data if found_any_issue else None
+            if not entry.name.endswith(".json"):
+                continue
+
+            stat = entry.stat()
+            if now - stat.st_mtime >= ttl:
+                os.remove(entry.path)
+            else:
+                alive.append((stat.st_atime, entry.path))
+        except OSError:
+            continue
+
+    alive.sort(reverse=True)
+    for _, path in alive[CACHE_MAX_ENTRIES:]:
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+
+def search_jira(params):
+    """Jira 검색 1회 (캐시에 있으면 재사용, 없으면 /search/jql 호출)"""
+    jira_cache_key = make_cache_key({"server": JIRA_SERVER, "params": params, "date": date.today().isoformat()})
+    raw = load_cache(JIRA_CACHE_DIR, jira_cache_key, JIRA_CACHE_TTL)
+    if raw is not None:
+        print(f"♻️ 캐시된 Jira 검색 결과를 사용합니다: {params['jql']}")
+        return raw
+
+    # 429 응답의 Retry-After는 공용 어댑터의 Retry 설정이 지켜줍니다.
+    # jira 라이브러리 대신 공용 세션으로 신규 검색 API(/search/jql, 커서 방식·전체 건수 계산 없음)를 직접 호출합니다.
+    response = SESSION.get(
+        f"{JIRA_SERVER.rstrip('/')}/rest/api/2/search/jql",
+        params=params,
+        auth=(JIRA_EMAIL, JIRA_TOKEN),
+        timeout=HTTP_TIMEOUT,
+    )
+    response.raise_for_status()
+    raw = response.json()
+    save_cache(JIRA_CACHE_DIR, jira_cache_key, raw)
+    return raw
+
+def get_jira_issues_by_keyword():
+    """Jira 이슈 수집 함수 (키워드별 이슈 목록 반환)"""
+    try:
+        print(f"🔍 '{TARGET_KEYWORDS_JOINED}' 관련 이슈 검색 중...")
+
+        # 키워드별 검색은 서로 독립적인 네트워크 I/O이므로 공용 커넥션 풀로 동시에 요청합니다. (결과 순서는 유지됨)
+        with ThreadPoolExecutor(max_workers=len(TARGET_KEYWORDS)) as executor:
+            results = list(executor.map(search_jira, JIRA_SEARCH_PARAMS.values()))
+        prune_cache(JIRA_CACHE_DIR, JIRA_CACHE_TTL)
+
+        issues_by_keyword = {keyword: raw["issues"] for keyword, raw in zip(JIRA_SEARCH_PARAMS, results)}
+        return issues_by_keyword if any(issues_by_keyword.values()) else None
         
     except Exception as e:
         print(f"❌ Jira 연결 또는 검색 오류: {e}")
         return None
 
+def format_issue_line(issue):
+    """이슈 한 건을 한 줄 텍스트로 변환"""
+    # 프롬프트 토큰을 줄이기 위해 긴 제목은 자르고, 완료된 이슈는 상태만 남깁니다.
+    fields = issue["fields"]
+    key = issue["key"]
+    summary = fields["summary"]
+    if len(summary) > SUMMARY_MAX_LEN:
+        summary = summary[:SUMMARY_MAX_LEN] + "…"
+    status = fields["status"]
+    status_name = status["name"]
+    if status["statusCategory"]["key"] == "done":
+        return f"- [{key}] {summary} (상태: {status_name})\n"
+
+    assignee = fields["assignee"]
+    assignee_name = assignee["displayName"] if assignee else "담당자 없음"
+    updated_date = fields["updated"][:10]
+    
+    return f"- [{key}] {summary} (상태: {status_name} | 담당: {assignee_name} | 수정일: {updated_date})\n"
+
+def format_issues(issues_by_keyword):
+    """키워드별 이슈 목록을 AI 요약용 텍스트로 변환"""
+    parts = []  # 문자열 += 누적 대신 리스트에 모은 뒤 마지막에 한 번만 join 합니다.
+    seen = set()  # 여러 키워드에 걸친 이슈는 처음 한 번만 상세히 적습니다.
+
+    for keyword, issues in issues_by_keyword.items():
+        if not issues:
+            parts.append(f"\n### [{keyword}] 관련 최근 이슈 없음\n")
+            continue
+            
+        parts.append(f"\n### [{keyword}] 관련 이슈 ({len(issues)}건)\n")
+        for issue in issues:
+            if issue["key"] in seen:
+                parts.append(f"- [{issue['key']}] (↑ 상동)\n")
+                continue
+            seen.add(issue["key"])
+            parts.append(format_issue_line(issue))
+
+    return "".join(parts)
+
+def build_direct_summary(issues_by_keyword):
+    """이슈가 1건 이하일 때 AI 호출 없이 바로 보낼 요약 생성"""
+    parts = [f"- [{keyword}] {len(issues)}건\n" for keyword, issues in issues_by_keyword.items()]
+    for issue in {issue["key"]: issue for issues in issues_by_keyword.values() for issue in issues}.values():
+        parts.append(format_issue_line(issue))
+    return "".join(parts)
+
 def summarize_with_gemini(text_data):
     """Gemini API를 사용하여 요약 생성"""
     if not text_data:
         return None
 
     try:
-        # ✅ 모델명 수정: 'gemini-2.5-flash-lite'가 현재 가장 안정적인 무료 티어 모델입니다.
-        model_name = "gemini-2.5-flash-lite"
-        print(f"🤖 선택된 AI 모델: {model_name}")
+        print(f"🤖 선택된 AI 모델: {GEMINI_MODEL_NAME}")
 
-        genai.configure(api_key=GEMINI_API_KEY)
-        model = genai.GenerativeModel(model_name)
+        # 고정 지시문은 system_instruction으로 앞에 두고, 매번 바뀌는 데이터만 뒤에 붙입니다.
+        prompt = f"[데이터]\n{text_data}"
 
-        prompt = f"""
-        당신은 IT 프로젝트 매니저입니다. 아래 Jira 이슈 데이터를 분석하여 주간 보고서를 작성하세요.
-        
-        [요청사항]
-        1. [{', '.join(TARGET_KEYWORDS)}] 키워드별로 섹션을 나누어 정리하세요.
-        2. 각 섹션마다 '현황 요약', '주요 이슈(ID포함)'를 포함하세요.
-        3. 이슈가 없는 키워드는 "특이사항 없음"으로 명시하세요.
-        4. 가독성 좋게 불렛포인트를 사용하여 작성하세요.
+        cache_key = make_cache_key({
+            "model": GEMINI_MODEL_NAME,
+            "instruction": REPORT_INSTRUCTION,
+            "prompt": prompt,
+            "config": GEMINI_GENERATION_CONFIG,  # 출력 길이·온도가 바뀌면 이전 설정의 요약을 재사용하지 않습니다.
+            "limit": KAKAOWORK_TEXT_LIMIT,  # 잘린 응답이 저장되므로 전송 한도가 바뀌면 새로 생성합니다.
+        })
+        cached = load_cache(LLM_CACHE_DIR, cache_key, LLM_CACHE_TTL)
+        if cached is not None:
+            print("♻️ 캐시된 요약을 사용합니다.")
+            return cached
 
-        [데이터]
-        {text_data}
-        """
+        # 전체 완료를 기다리지 않고 스트리밍으로 받아 조각을 모읍니다.
+        # 카카오워크에는 앞 KAKAOWORK_TEXT_LIMIT자만 실리므로, ("#" 제거 후 기준) 그 이상 받으면 생성을 끊습니다.
+        chunks = []
+        received = 0
+        for chunk in GEMINI_MODEL.generate_content(prompt, stream=True, request_options={"retry": GEMINI_RETRY}):
+            try:
+                text = chunk.text
+            except ValueError:
+                # 종료 사유(STOP/MAX_TOKENS)나 사용량만 담긴 조각처럼 텍스트가 없는 조각은 건너뜁니다.
+                continue
+            chunks.append(text)
+            received += len(text) - text.count("#")
+            if received > KAKAOWORK_TEXT_LIMIT:
+                break
+        summary = "".join(chunks)
 
-        response = model.generate_content(prompt)
-        return response.text
+        if summary:  # 빈 응답은 저장하지 않아, 캐시 적중 시 항상 내용이 있는 요약만 돌려줍니다.
+            save_cache(LLM_CACHE_DIR, cache_key, summary)
+            prune_cache(LLM_CACHE_DIR, LLM_CACHE_TTL)
+        return summary
 
     except Exception as e:
         print(f"❌ Gemini API 요약 오류: {e}")
         return None
 
+def log_webhook_delivery(status_code, payload, error=None):
+    """웹훅 전송 결과를 기록 (실패한 경우에만 재전송용 payload 보관, 최근 WEBHOOK_LOG_MAX_ENTRIES건만 유지)"""
+    record = {"ts": time.time(), "status": status_code}
+    if error is not None:
+        record["error"] = error
+    if status_code != 200:
+        record["payload"] = payload
+    try:
+        try:
+            with open(WEBHOOK_LOG_PATH, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            lines = []
+        lines = lines[-(WEBHOOK_LOG_MAX_ENTRIES - 1):] + [json.dumps(record, ensure_ascii=False)]
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(WEBHOOK_LOG_PATH, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+    except OSError as e:
+        print(f"⚠️ 웹훅 전송 기록 실패: {e}")
+
 def send_kakaowork_message(summary_text):
     """카카오워크 블록키트 전송 함수 (최종 안정화 버전)"""
     if not KAKAOWORK_WEBHOOK_URL:
@@ -94,10 +351,11 @@ def send_kakaowork_message(summary_text):
 
     # 1. AI 마크다운 정제 (카카오워크에서 에러 유발하는 기호 제거)
     # ### 같은 제목 기호를 제거하고 줄바꿈으로 대체합니다.
-    clean_summary = summary_text.replace("###", "").replace("##", "").replace("#", "")
+    # ("###"/"##"도 결국 "#"의 반복이므로 한 번의 치환으로 충분합니다.)
+    clean_summary = summary_text.replace("#", "")
     
     # 2. 본문 길이 제한 (안전하게 500자 내외 추천)
-    safe_summary = (clean_summary[:500] + "\n...(중략)") if len(clean_summary) > 500 else clean_summary
+    safe_summary = clean_summary if len(clean_summary) <= KAKAOWORK_TEXT_LIMIT else clean_summary[:KAKAOWORK_TEXT_LIMIT] + "\n...(중략)"
 
     # 3. 버튼 URL 유효성 체크
     jira_url = JIRA_SERVER if (JIRA_SERVER and JIRA_SERVER.startswith("http")) else "https://atlassian.net"
@@ -141,7 +399,8 @@ def send_kakaowork_message(summary_text):
         # 디버깅용: 전송 직전의 JSON을 출력하여 수동 검증 가능하게 함
         # print(f"DEBUG PAYLOAD: {json.dumps(payload, ensure_ascii=False)}")
         
-        response = requests.post(KAKAOWORK_WEBHOOK_URL, json=payload)
+        response = SESSION.post(KAKAOWORK_WEBHOOK_URL, json=payload, timeout=HTTP_TIMEOUT)
+        log_webhook_delivery(response.status_code, payload)
         
         if response.status_code == 200:
             print("✅ 카카오워크 메시지 전송 성공!")
@@ -150,19 +409,34 @@ def send_kakaowork_message(summary_text):
             print(f"🔍 상세 에러: {response.text}")
             # 에러가 계속된다면 위 DEBUG PAYLOAD를 복사해서 블록킷 빌더에 붙여넣어 보세요.
     except Exception as e:
+        # 재시도를 모두 소진한 429/5xx, 연결 오류도 예외로 올라오므로 여기서도 기록합니다.
+        log_webhook_delivery(None, payload, error=str(e))
         print(f"❌ 전송 중 예외 발생: {e}")
 
 # === 메인 실행 로직 ===
 if __name__ == "__main__":
     print(f"🚀 스크립트 실행 시작: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+
+    # 0. 환경 변수 확인 (설정이 빠졌다면 Jira 조회·Gemini 호출 전에 바로 종료)
+    missing_env_vars = [name for name in REQUIRED_ENV_VARS if not os.environ.get(name)]
+    if missing_env_vars:
+        print(f"❌ 에러: 환경 변수가 없습니다: {', '.join(missing_env_vars)}")
+        sys.exit(1)
     
     # 1. Jira 데이터 수집
-    raw_data = get_jira_issues_by_keyword()
+    issues_by_keyword = get_jira_issues_by_keyword()
     
-    if raw_data:
-        print("📝 데이터 수집 완료, AI 요약 진행 중...")
-        # 2. Gemini 요약
-        summary = summarize_with_gemini(raw_data)
+    if issues_by_keyword:
+        issue_count = len({issue["key"] for issues in issues_by_keyword.values() for issue in issues})
+
+        if issue_count <= DIRECT_SUMMARY_MAX_ISSUES:
+            # 이슈가 거의 없으면 AI 요약이 주는 가치가 없으므로 바로 정리해서 보냅니다.
+            print(f"📝 이슈 {issue_count}건, AI 요약 없이 바로 정리합니다.")
+            summary = build_direct_summary(issues_by_keyword)
+        else:
+            print("📝 데이터 수집 완료, AI 요약 진행 중...")
+            # 2. Gemini 요약
+            summary = summarize_with_gemini(format_issues(issues_by_keyword))
         
         if summary:
             print("📩 카카오워크 전송 중...")
@@ -174,6 +448,3 @@ if __name__ == "__main__":
         print("⚠️ 수집된 데이터가 없습니다. 알림을 건너뜁니다.")
         # 데이터가 없을 때도 알림을 보내고 싶다면 아래 주석을 해제하세요.
         # send_kakaowork_message("이번 주 검색된 Jira 이슈가 없습니다.")
-
-
-